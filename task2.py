@@ -1,17 +1,43 @@
+import gzip
+import json
+import os
 import pickle
+from bisect import bisect_left, bisect_right
 from collections import UserDict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from weakref import WeakSet
+
+
+@lru_cache(maxsize=4096)
+def _parse_ddmmyyyy(value):
+    return datetime.strptime(value, "%d.%m.%Y").date()
+
+
+def _restore_slots(obj, state):
+    # Pickles written before __slots__ carry a plain dict state.
+    if isinstance(state, tuple):
+        state = state[1]
+    for key, value in state.items():
+        setattr(obj, key, value)
 
 
 class Field:
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
+    def __setstate__(self, state):
+        _restore_slots(self, state)
+
     def __str__(self):
         return str(self.value)
 
 
 class Name(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         if not value:
             raise ValueError("Name cannot be empty")
@@ -23,47 +49,83 @@ class PhoneValidationError(Exception):
 
 
 class Phone(Field):
-    def __init__(self, value):
-        if not value.isdigit() or len(value) != 10:
+    __slots__ = ()
+
+    def __init__(self, value, _trusted=False):
+        if not _trusted and (
+            len(value) != 10 or not value.isascii() or not value.isdigit()
+        ):
             raise PhoneValidationError("Phone number must be a 10-digit number")
         super().__init__(value)
 
 
 class Birthday(Field):
+    __slots__ = ("date",)
+
     def __init__(self, value):
         try:
-            datetime.strptime(value, "%d.%m.%Y")
+            self.date = _parse_ddmmyyyy(value)
         except ValueError:
             raise ValueError(
                 "Invalid date format for birthday. Birthday should be in the format DD.MM.YYYY"
             )
         super().__init__(value)
 
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if not hasattr(self, "date"):
+            self.date = _parse_ddmmyyyy(self.value)
+
 
 class Record:
+    __slots__ = ("name", "phones", "_birthday", "_owners")
+
     def __init__(self, name):
+        self._owners = WeakSet()
         self.name = Name(name)
-        self.phones = []
+        self.phones = {}
         self.birthday = None
 
+    @property
+    def birthday(self):
+        return self._birthday
+
+    @birthday.setter
+    def birthday(self, birthday):
+        self._birthday = birthday
+        for index in self._owners:
+            index.invalidate()
+
+    def __getstate__(self):
+        return None, {
+            "name": self.name,
+            "phones": self.phones,
+            "_birthday": self._birthday,
+        }
+
+    def __setstate__(self, state):
+        self._owners = WeakSet()
+        _restore_slots(self, state)
+        if isinstance(self.phones, list):
+            self.phones = {phone.value: phone for phone in self.phones}
+
     def add_phone(self, phone):
         try:
-            phone_obj = Phone(phone)
-            self.phones.append(phone_obj)
+            self.phones[phone] = Phone(phone)
         except ValueError as e:
             return str(e)
 
     def remove_phone(self, phone):
-        for phone_obj in self.phones:
-            if phone_obj.value == phone:
-                self.phones.remove(phone_obj)
-                return
+        self.phones.pop(phone, None)
 
     def edit_phone(self, old_phone, new_phone):
-        for phone_obj in self.phones:
-            if phone_obj.value == old_phone:
-                phone_obj.value = new_phone
-                return
+        phone_obj = self.phones.get(old_phone)
+        if phone_obj:
+            phone_obj.value = new_phone
+            self.phones = {
+                new_phone if key == old_phone else key: value
+                for key, value in self.phones.items()
+            }
 
     def add_birthday(self, birthday):
         try:
@@ -74,231 +136,340 @@ class Record:
             return str(e)
 
     def find_phone(self, phone):
-        for phone_obj in self.phones:
-            if phone_obj.value == phone:
-                return phone_obj
+        return self.phones.get(phone)
 
     def __str__(self):
-        phone_str = "; ".join(str(phone) for phone in self.phones)
+        phone_str = "; ".join(p.value for p in self.phones.values())
         birthday_str = str(self.birthday) if self.birthday else "N/A"
         return f"Contact name: {self.name.value}, phones: {phone_str}, birthday: {birthday_str}"
 
 
+class _BirthdayIndex:
+    __slots__ = ("keys", "records", "__weakref__")
+
+    def __init__(self):
+        self.invalidate()
+
+    def invalidate(self):
+        self.keys = None
+        self.records = None
+
+
+class _RecordDict(dict):
+    # Registers the book's birthday index with every record stored in it, so
+    # changes to the book or to any record's birthday drop the index.
+    __slots__ = ("index",)
+
+    def __init__(self, index, records=()):
+        super().__init__()
+        self.index = index
+        self.update(records)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __setitem__(self, key, record):
+        record._owners.add(self.index)
+        self.index.invalidate()
+        super().__setitem__(key, record)
+
+    def __delitem__(self, key):
+        self.index.invalidate()
+        super().__delitem__(key)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        for key, record in dict(*args, **kwargs).items():
+            self[key] = record
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, *args):
+        self.index.invalidate()
+        return super().pop(*args)
+
+    def popitem(self):
+        self.index.invalidate()
+        return super().popitem()
+
+    def clear(self):
+        self.index.invalidate()
+        super().clear()
+
+
 class AddressBook(UserDict):
+    def __init__(self, *args, **kwargs):
+        self._bday_index = _BirthdayIndex()
+        super().__init__(*args, **kwargs)
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, records):
+        self._data = _RecordDict(self._bday_index, records)
+
+    def __getstate__(self):
+        return {"data": dict(self._data)}
+
+    def __setstate__(self, state):
+        self._bday_index = _BirthdayIndex()
+        self.data = state["data"]
+
+    def __copy__(self):
+        book = self.__class__.__new__(self.__class__)
+        book.__setstate__(self.__getstate__())
+        return book
+
     def add_record(self, record):
         self.data[record.name.value.lower()] = record
 
+    def _add_lowered(self, record):
+        self.data[record.name.value] = record
+
+    def _find_lowered(self, name):
+        return self.data.get(name)
+
+    def _delete_lowered(self, name):
+        return self.data.pop(name, None)
+
     def find(self, name):
         return self.data.get(name.lower())
 
     def delete(self, name):
-        if name.lower() in self.data:
-            del self.data[name.lower()]
+        return self._delete_lowered(name.lower())
+
+    def to_plain(self):
+        return {
+            name: {
+                "name": record.name.value,
+                "phones": list(record.phones),
+                "birthday": record.birthday.value if record.birthday else None,
+            }
+            for name, record in self.data.items()
+        }
+
+    @classmethod
+    def from_plain(cls, data):
+        book = cls()
+        for name, fields in data.items():
+            record = Record(fields.get("name", name))
+            record.phones = {
+                phone: Phone(phone, _trusted=True) for phone in fields["phones"]
+            }
+            if fields["birthday"]:
+                record.birthday = Birthday(fields["birthday"])
+            book[name] = record
+        return book
+
+    def _birthday_index(self):
+        index = self._bday_index
+        if index.keys is None:
+            entries = sorted(
+                (record.birthday.date.month, record.birthday.date.day, name, record)
+                for name, record in self.data.items()
+                if record.birthday
+            )
+            index.keys = [(month, day) for month, day, _, _ in entries]
+            index.records = [record for _, _, _, record in entries]
+        return index.keys, index.records
 
     def get_birthdays_per_week(self):
-        today = datetime.now()
-        next_week = today + timedelta(days=7)
-        upcoming_birthdays = []
-
-        for record in self.data.values():
-            if record.birthday:
-                birthday_date = datetime.strptime(record.birthday.value, "%d.%m.%Y")
-                birthday_date = birthday_date.replace(year=today.year)
-                if today < birthday_date <= next_week:
-                    upcoming_birthdays.append(
-                        (record.name.value, record.birthday.value)
-                    )
-
-        return upcoming_birthdays
-
-
-def input_error(func):
-    def inner(*args, **kwargs):
-        try:
-            return func(*args, **kwargs)
-        except ValueError:
-            return "Give me name and phone please."
-        except KeyError:
-            return "Enter user name."
-        except IndexError:
-            return "Give me name and phone please."
-        except PhoneValidationError:
-            return "Phone number must be a 10-digit number"
-        except BirthdayError:
-            return "Invalid date format for birthday"
+        keys, records = self._birthday_index()
+        today = date.today()
+        start = today + timedelta(days=1)
+        end = today + timedelta(days=7)
+        lo = bisect_left(keys, (start.month, start.day))
+        hi = bisect_right(keys, (end.month, end.day))
+
+        if start.year == end.year:
+            window = records[lo:hi]
+        else:
+            window = records[lo:] + records[:hi]
 
-    return inner
+        return [(record.name.value, record.birthday.value) for record in window]
 
 
 def parse_input(user_input):
-    cmd, *args = user_input.split()
-    cmd = cmd.strip().lower()
-    return cmd, args
+    parts = user_input.split(None, 1)
+    if not parts:
+        return "", ""
+    cmd = parts[0].lower()
+    rest = parts[1] if len(parts) > 1 else ""
+    return cmd, rest
 
 
-@input_error
-def add_contact(args, contacts):
-    if len(args) < 2:
+def add_contact(rest, contacts):
+    args = rest.split()
+    if len(args) != 2:
         return "Give me name and phone please."
 
     name, phone = args
+    name = name.lower()
     if name not in contacts:
-        record = Record(name.lower())
-        record.add_phone(phone)
-        contacts.add_record(record)
+        record = Record(name)
+        try:
+            record.add_phone(phone)
+        except PhoneValidationError as e:
+            return str(e)
+        contacts._add_lowered(record)
         return "Contact added."
     else:
         return "Contact already exists. Use 'change' to update."
 
 
-@input_error
-def change_contact(args, contacts):
-    if len(args) < 2:
+def change_contact(rest, contacts):
+    args = rest.split()
+    if len(args) != 2:
         return "Give me name and phone please."
 
     name, phone = args
-    name = args[0].lower()
-    if name in contacts:
-        record = contacts[name.lower()]
-        if record.phones:
-            record.remove_phone(record.phones[0].value)
-        message = record.add_phone(phone)
-        if message:
-            return message
-        else:
-            return "Contact updated."
-    else:
+    record = contacts._find_lowered(name.lower())
+    if record is None:
         return "Contact not found."
+    try:
+        new_phone = Phone(phone)
+    except PhoneValidationError as e:
+        return str(e)
+    if record.phones:
+        record.remove_phone(next(iter(record.phones)))
+    record.phones[phone] = new_phone
+    return "Contact updated."
 
 
-@input_error
-def show_phone(args, contacts):
+def show_phone(rest, contacts):
+    args = rest.split()
     if len(args) < 1:
         return "Give me name and phone please."
 
-    name = args[0].lower()
-    if name in contacts:
-        record = contacts[name.lower()]
-        return "; ".join(str(phone) for phone in record.phones)
-    else:
+    record = contacts._find_lowered(args[0].lower())
+    if record is None:
         return "Contact not found."
+    return "; ".join(p.value for p in record.phones.values())
 
 
-@input_error
-def show_all(args, contacts):
+def show_all(rest, contacts):
     if not contacts:
         return "No contacts found."
     result = "\n".join(
-        [
-            f"{name.capitalize()}: {'; '.join(str(phone) for phone in record.phones)}"
-            for name, record in contacts.items()
-        ]
+        f"{name.capitalize()}: {'; '.join(p.value for p in record.phones.values())}"
+        for name, record in contacts.items()
     )
     return result
 
 
-@input_error
-def remove_phone(args, contacts):
+def remove_phone(rest, contacts):
+    args = rest.split()
     if len(args) < 1:
         return "Give me the name of the contact you want to remove."
 
-    name = args[0].lower()
-    if name in contacts:
-        del contacts.data[name]
-        return "Contact removed."
-    else:
+    if contacts._delete_lowered(args[0].lower()) is None:
         return "Contact not found."
+    return "Contact removed."
 
 
-@input_error
-def add_birthday(args, contacts):
-    if len(args) < 2:
+def add_birthday(rest, contacts):
+    args = rest.split()
+    if len(args) != 2:
         return "Give me name and date of birth in the format DD.MM.YYYY."
 
     name, birthday = args
-    name = args[0].lower()
-    if name in contacts:
-        record = contacts[name.lower()]
-        result = record.add_birthday(birthday)
-        return result
-    else:
+    record = contacts._find_lowered(name.lower())
+    if record is None:
         return "Contact not found."
+    return record.add_birthday(birthday)
 
 
-@input_error
-def show_birthday(args, contacts):
+def show_birthday(rest, contacts):
+    args = rest.split()
     if len(args) < 1:
         return "Give me name and date of birth in the format DD.MM.YYYY."
 
-    name = args[0].lower()
-    if name in contacts:
-        birthday = contacts[name.lower()].birthday
-        if birthday:
-            return birthday.value
-        else:
-            return "Birthday not set."
-    else:
+    record = contacts._find_lowered(args[0].lower())
+    if record is None:
         return "Contact not found."
-
-
-class BirthdayError(Exception):
-    def __init__(self, message="Invalid date format for birthday"):
-        self.message = message
-        super().__init__(self.message)
+    if record.birthday:
+        return record.birthday.value
+    else:
+        return "Birthday not set."
 
 
 def save_address_book(contacts, filename):
+    data = json.dumps(contacts.to_plain()).encode("utf-8")
+    data = gzip.compress(data, compresslevel=1)
     with open(filename, "wb") as file:
-        pickle.dump(contacts, file)
+        file.write(data)
+
+
+def load_pickled_address_book(filename):
+    with open(filename, "rb") as file:
+        return pickle.load(file)
 
 
 def load_address_book(filename):
     try:
         with open(filename, "rb") as file:
-            contacts = pickle.load(file)
-            return contacts
+            data = file.read()
+        if data[:2] == b"\x1f\x8b":
+            data = gzip.decompress(data)
+        contacts = AddressBook.from_plain(json.loads(data))
+        return contacts
     except FileNotFoundError:
         return AddressBook()
 
 
-def main():
+def _load_contacts():
     try:
-        contacts = load_address_book("address_book.pickle")
-    except:
-        contacts = AddressBook()
+        if os.path.exists("address_book.json.gz"):
+            return load_address_book("address_book.json.gz")
+        if os.path.exists("address_book.json"):
+            return load_address_book("address_book.json")
+        if os.path.exists("address_book.pickle"):
+            return load_pickled_address_book("address_book.pickle")
+    except Exception:
+        pass
+    return AddressBook()
+
+
+COMMANDS = {
+    "add": add_contact,
+    "change": change_contact,
+    "phone": show_phone,
+    "all": show_all,
+    "remove": remove_phone,
+    "add-birthday": add_birthday,
+    "show-birthday": show_birthday,
+}
+
+
+def main():
+    contacts = None
 
     print("Welcome to the assistant bot!")
     while True:
         user_input = input("Enter a command: ")
-        command, args = parse_input(user_input)
+        command, rest = parse_input(user_input)
+
+        handler = COMMANDS.get(command)
+        if contacts is None and (handler or command == "birthdays"):
+            contacts = _load_contacts()
 
-        if command in ["close", "exit"]:
-            save_address_book(contacts, "address_book.pickle")
+        if handler:
+            print(handler(rest, contacts))
+        elif command in ["close", "exit"]:
+            if contacts is not None:
+                save_address_book(contacts, "address_book.json.gz")
             print("Good bye!")
             break
         elif command == "hello":
             print("How can I help you?")
-        elif command == "add":
-            result = add_contact(args, contacts)
-            print(result)
-        elif command == "change":
-            result = change_contact(args, contacts)
-            print(result)
-        elif command == "phone":
-            result = show_phone(args, contacts)
-            print(result)
-        elif command == "all":
-            result = show_all(args, contacts)
-            print(result)
-        elif command == "remove":
-            result = remove_phone(args, contacts)
-            print(result)
-        elif command == "add-birthday":
-            result = add_birthday(args, contacts)
-            print(result)
-        elif command == "show-birthday":
-            result = show_birthday(args, contacts)
-            print(result)
         elif command == "birthdays":
             upcoming_birthdays = contacts.get_birthdays_per_week()
             if upcoming_birthdays:
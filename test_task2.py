@@ -0,0 +1,302 @@
+import io
+import os
+import pickle
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import task2
+from task2 import AddressBook, Birthday, Name, Phone, Record
+
+
+def fake_today(year, month, day):
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return cls(year, month, day)
+
+    return mock.patch.object(task2, "date", FakeDate)
+
+
+def make_book(**birthdays):
+    book = AddressBook()
+    for name, birthday in birthdays.items():
+        record = Record(name)
+        record.add_birthday(birthday)
+        book.add_record(record)
+    return book
+
+
+class GetBirthdaysPerWeekTest(unittest.TestCase):
+    def test_window_is_sorted_by_date(self):
+        book = make_book(b="20.06.1990", a="18.06.1985", c="30.06.2000")
+        with fake_today(2025, 6, 15):
+            self.assertEqual(
+                book.get_birthdays_per_week(),
+                [("a", "18.06.1985"), ("b", "20.06.1990")],
+            )
+
+    def test_window_excludes_today_and_includes_seventh_day(self):
+        book = make_book(a="15.06.1990", b="22.06.1990", c="23.06.1990")
+        with fake_today(2025, 6, 15):
+            self.assertEqual(book.get_birthdays_per_week(), [("b", "22.06.1990")])
+
+    def test_window_wraps_over_new_year(self):
+        book = make_book(
+            a="01.01.1990", b="31.12.1985", c="06.01.2000", d="29.12.1999"
+        )
+        with fake_today(2025, 12, 29):
+            self.assertEqual(
+                book.get_birthdays_per_week(),
+                [("b", "31.12.1985"), ("a", "01.01.1990")],
+            )
+
+    def test_feb_29_in_non_leap_year_falls_before_march_1(self):
+        book = make_book(a="29.02.2000", b="01.03.1990")
+        with fake_today(2025, 2, 25):
+            self.assertEqual(
+                book.get_birthdays_per_week(),
+                [("a", "29.02.2000"), ("b", "01.03.1990")],
+            )
+        with fake_today(2025, 2, 21):
+            self.assertEqual(book.get_birthdays_per_week(), [])
+
+    def test_feb_29_in_leap_year(self):
+        book = make_book(a="29.02.2000")
+        with fake_today(2024, 2, 25):
+            self.assertEqual(book.get_birthdays_per_week(), [("a", "29.02.2000")])
+
+
+class BirthdayIndexInvalidationTest(unittest.TestCase):
+    def setUp(self):
+        self.book = make_book(a="01.01.1990")
+        self.record = self.book.find("a")
+        self.today = fake_today(2025, 12, 29)
+        self.today.start()
+        self.addCleanup(self.today.stop)
+        self.assertEqual(self.book.get_birthdays_per_week(), [("a", "01.01.1990")])
+
+    def test_add_birthday(self):
+        self.record.add_birthday("15.06.1990")
+        self.assertEqual(self.book.get_birthdays_per_week(), [])
+
+    def test_assign_birthday(self):
+        self.record.birthday = Birthday("15.06.1990")
+        self.assertEqual(self.book.get_birthdays_per_week(), [])
+
+    def test_clear_birthday(self):
+        self.record.birthday = None
+        self.assertEqual(self.book.get_birthdays_per_week(), [])
+
+    def test_add_record(self):
+        record = Record("b")
+        record.add_birthday("30.12.1990")
+        self.book.add_record(record)
+        self.assertEqual(
+            self.book.get_birthdays_per_week(),
+            [("b", "30.12.1990"), ("a", "01.01.1990")],
+        )
+
+    def test_delete_record(self):
+        self.book.delete("a")
+        self.assertEqual(self.book.get_birthdays_per_week(), [])
+
+    def test_record_shared_with_another_book_moves_out_of_window(self):
+        other = AddressBook()
+        other.add_record(self.record)
+        self.record.birthday = None
+        self.assertEqual(self.book.get_birthdays_per_week(), [])
+
+    def test_record_shared_with_another_book_moves_into_window(self):
+        record = Record("b")
+        record.add_birthday("15.06.1990")
+        self.book.add_record(record)
+        self.assertEqual(self.book.get_birthdays_per_week(), [("a", "01.01.1990")])
+        other = AddressBook()
+        other.add_record(record)
+        record.add_birthday("30.12.1990")
+        self.assertEqual(
+            self.book.get_birthdays_per_week(),
+            [("b", "30.12.1990"), ("a", "01.01.1990")],
+        )
+
+    def test_copy_keeps_both_books_current(self):
+        copy = self.book.copy()
+        self.record.add_birthday("31.12.1990")
+        self.assertEqual(self.book.get_birthdays_per_week(), [("a", "31.12.1990")])
+        self.assertEqual(copy.get_birthdays_per_week(), [("a", "31.12.1990")])
+
+    def test_direct_data_assignment(self):
+        record = Record("b")
+        record.add_birthday("30.12.1990")
+        self.book.data["b"] = record
+        self.assertEqual(
+            self.book.get_birthdays_per_week(),
+            [("b", "30.12.1990"), ("a", "01.01.1990")],
+        )
+
+
+class RecordPhonesTest(unittest.TestCase):
+    def test_edit_phone_keeps_position(self):
+        book = AddressBook()
+        task2.add_contact("a 1111111111", book)
+        record = book.find("a")
+        record.add_phone("2222222222")
+        record.edit_phone("1111111111", "3333333333")
+        self.assertEqual(list(record.phones), ["3333333333", "2222222222"])
+        self.assertEqual(task2.change_contact("a 4444444444", book), "Contact updated.")
+        self.assertEqual(list(record.phones), ["2222222222", "4444444444"])
+
+
+class PlainRoundTripTest(unittest.TestCase):
+    def test_round_trip_keeps_record_fields(self):
+        book = make_book(Ann="01.01.1990")
+        book.find("ann").add_phone("0123456789")
+        restored = AddressBook.from_plain(book.to_plain())
+        record = restored.find("ann")
+        self.assertEqual(record.name.value, "Ann")
+        self.assertEqual(list(record.phones), ["0123456789"])
+        self.assertEqual(record.birthday.date, date(1990, 1, 1))
+
+
+class HandlersTest(unittest.TestCase):
+    def setUp(self):
+        self.book = AddressBook()
+        task2.add_contact("Ann 0123456789", self.book)
+
+    def test_change_with_invalid_phone_keeps_old_phone(self):
+        self.assertEqual(
+            task2.change_contact("ann 12", self.book),
+            "Phone number must be a 10-digit number",
+        )
+        self.assertEqual(task2.show_phone("ann", self.book), "0123456789")
+
+    def test_fullwidth_digits_are_rejected(self):
+        self.assertEqual(
+            task2.add_contact("bob \uff10123456789", self.book),
+            "Phone number must be a 10-digit number",
+        )
+        self.assertIsNone(self.book.find("bob"))
+
+    def test_add_birthday_with_extra_arguments(self):
+        self.assertEqual(
+            task2.add_birthday("ann 01.01.1990 extra", self.book),
+            "Give me name and date of birth in the format DD.MM.YYYY.",
+        )
+        self.assertIsNone(self.book.find("ann").birthday)
+
+    def test_parse_input(self):
+        self.assertEqual(task2.parse_input(""), ("", ""))
+        self.assertEqual(task2.parse_input("   "), ("", ""))
+        self.assertEqual(task2.parse_input("EXIT"), ("exit", ""))
+        self.assertEqual(
+            task2.parse_input("add\tbob 0123456789"), ("add", "bob 0123456789")
+        )
+
+    def test_add_with_tab_separator(self):
+        command, rest = task2.parse_input("add\tbob 0123456789")
+        self.assertEqual(task2.COMMANDS[command](rest, self.book), "Contact added.")
+        self.assertEqual(task2.show_phone("bob", self.book), "0123456789")
+
+
+class Legacy:
+    # Pickles as cls with a plain __dict__ state, the way instances were
+    # stored before the classes gained __slots__.
+    def __init__(self, cls, **state):
+        self.cls = cls
+        self.state = state
+
+    def __reduce__(self):
+        return object.__new__, (self.cls,), self.state
+
+
+def legacy_book(phones, birthday):
+    record = Legacy(
+        Record,
+        name=Legacy(Name, value="ann"),
+        phones=phones,
+        birthday=birthday,
+    )
+    return pickle.dumps(Legacy(AddressBook, data={"ann": record}))
+
+
+class LegacyPickleTest(unittest.TestCase):
+    def assert_migrated(self, book):
+        record = book.find("ann")
+        self.assertEqual(record.name.value, "ann")
+        self.assertEqual(list(record.phones), ["0123456789"])
+        self.assertIsInstance(record.phones["0123456789"], Phone)
+        self.assertEqual(record.birthday.date, date(1990, 6, 17))
+        with fake_today(2025, 6, 15):
+            self.assertEqual(book.get_birthdays_per_week(), [("ann", "17.06.1990")])
+            record.birthday = None
+            self.assertEqual(book.get_birthdays_per_week(), [])
+
+    def test_baseline_book(self):
+        data = legacy_book(
+            phones=[Legacy(Phone, value="0123456789")],
+            birthday=Legacy(Birthday, value="17.06.1990"),
+        )
+        self.assert_migrated(pickle.loads(data))
+
+    def test_book_with_phone_dict_and_cached_date(self):
+        data = legacy_book(
+            phones={"0123456789": Legacy(Phone, value="0123456789")},
+            birthday=Legacy(Birthday, value="17.06.1990", date=date(1990, 6, 17)),
+        )
+        self.assert_migrated(pickle.loads(data))
+
+    def test_slotted_round_trip(self):
+        book = make_book(ann="17.06.1990")
+        book.find("ann").add_phone("0123456789")
+        self.assert_migrated(pickle.loads(pickle.dumps(book)))
+
+
+class LoadContactsTest(unittest.TestCase):
+    def setUp(self):
+        cwd = os.getcwd()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def save(self, filename, name):
+        book = AddressBook()
+        book.add_record(Record(name))
+        if filename.endswith(".pickle"):
+            with open(filename, "wb") as file:
+                pickle.dump(book, file)
+        elif filename.endswith(".gz"):
+            task2.save_address_book(book, filename)
+        else:
+            with open(filename, "w", encoding="utf-8") as file:
+                file.write(f'{{"{name}": {{"phones": [], "birthday": null}}}}')
+
+    def loaded_names(self):
+        return list(task2._load_contacts())
+
+    def test_no_files(self):
+        self.assertEqual(self.loaded_names(), [])
+
+    def test_lookup_order(self):
+        self.save("address_book.pickle", "pickled")
+        self.assertEqual(self.loaded_names(), ["pickled"])
+        self.save("address_book.json", "plain")
+        self.assertEqual(self.loaded_names(), ["plain"])
+        self.save("address_book.json.gz", "gzipped")
+        self.assertEqual(self.loaded_names(), ["gzipped"])
+
+    def test_main_migrates_pickle_to_gzip_json(self):
+        self.save("address_book.pickle", "ann")
+        with mock.patch("builtins.input", side_effect=["all", "exit"]), mock.patch(
+            "sys.stdout", new_callable=io.StringIO
+        ) as stdout:
+            task2.main()
+        self.assertIn("Ann: ", stdout.getvalue())
+        self.assertTrue(os.path.exists("address_book.json.gz"))
+        self.assertEqual(self.loaded_names(), ["ann"])
+
+
+if __name__ == "__main__":
+    unittest.main()